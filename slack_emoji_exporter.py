@@ -15,17 +15,75 @@ Authentication is handled via:
 import argparse
 import os
 import sys
+import base64
+import hashlib
 import json
+import mimetypes
+import queue
+import socket
 import time
-import random
+import uuid
+import threading
 import requests
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Optional: stream-parse the emoji list instead of buffering the whole response
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: show a progress bar while downloading
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
 
 # Default paths
 DEFAULT_OUTPUT_DIR = "emoji_downloads"
 
+# Download settings
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MAX_PER_HOST = 16
+DOWNLOAD_TIMEOUT = 30
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+HEDGE_POLL_INTERVAL = 0.1
+
+# Upload settings
+DEFAULT_MAX_UPLOADS = 4
+EMOJI_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif"}
+# Fixed multipart boundary for the whole run, so upload bodies are built once per file
+UPLOAD_BOUNDARY = f"slack-emoji-exporter-{uuid.uuid4().hex}"
+UPLOAD_CONTENT_TYPE = f"multipart/form-data; boundary={UPLOAD_BOUNDARY}"
+
+def create_session(pool_size):
+    """Create a requests session that keeps connections alive across threads"""
+    session = requests.Session()
+    # Block on a full pool instead of opening throwaway connections past pool_size,
+    # which also caps the number of in-flight requests to any one host
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True,
+                          max_retries=Retry(total=3, backoff_factor=0.5))
+    session.mount("https://", adapter)
+    return session
+
+# Shared session for Slack API calls, so repeated requests reuse pooled connections
+_SESSION = create_session(DEFAULT_MAX_PER_HOST)
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return number
+
 def setup_argparse():
     """Configure command-line argument parsing"""
     parser = argparse.ArgumentParser(description="Export Slack emojis from one workspace to another")
@@ -33,6 +91,12 @@ def setup_argparse():
     # Common arguments
     parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
                       help=f"Directory to save emoji files (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--max-concurrency", type=positive_int, default=DEFAULT_MAX_CONCURRENCY,
+                      help=f"Maximum number of parallel emoji downloads (default: {DEFAULT_MAX_CONCURRENCY})")
+    parser.add_argument("--max-per-host", type=positive_int, default=DEFAULT_MAX_PER_HOST,
+                      help=f"Maximum number of parallel downloads from a single host (default: {DEFAULT_MAX_PER_HOST})")
+    parser.add_argument("--max-uploads", type=positive_int, default=DEFAULT_MAX_UPLOADS,
+                      help=f"Maximum number of parallel emoji uploads (default: {DEFAULT_MAX_UPLOADS})")
     
     # Create subparsers for different operations
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
@@ -73,38 +137,199 @@ def setup_argparse():
     
     return parser
 
-def list_emojis(token, output_file):
-    """List all custom emojis in a Slack workspace and save to a file"""
+def error_excerpt(response, limit=256):
+    """Return the start of an error response body without reading or decoding all of it"""
+    chunk = next(response.iter_content(chunk_size=limit), b"")
+    return chunk[:limit].decode("utf-8", "replace")
+
+def parse_emoji_list(stream):
+    """Stream-parse an emoji.list response, skipping aliases as they arrive"""
+    ok = None
+    error = None
+    custom_emojis = {}
+    name = None
+    for prefix, event, value in ijson.parse(stream):
+        if prefix == "ok" and event == "boolean":
+            ok = value
+        elif prefix == "error" and event == "string":
+            error = value
+        elif prefix == "emoji" and event == "map_key":
+            name = value
+        elif event == "string" and prefix == f"emoji.{name}":
+            if not value.startswith("alias:"):
+                custom_emojis[name] = value
+    return {"ok": ok, "error": error, "emoji": custom_emojis}
+
+def list_emojis(token, output_file, save=True):
+    """List all custom emojis in a Slack workspace and optionally save them to a file"""
     url = "https://slack.com/api/emoji.list"
     headers = {"Authorization": f"Bearer {token}"}
     
-    response = requests.get(url, headers=headers)
-    if not response.ok:
-        print(f"Error fetching emojis: {response.status_code} {response.text}")
-        sys.exit(1)
+    with _SESSION.get(url, headers=headers, stream=ijson is not None) as response:
+        if not response.ok:
+            print(f"Error fetching emojis: {response.status_code} {error_excerpt(response)}")
+            sys.exit(1)
         
-    data = response.json()
+        if ijson is not None:
+            # Let urllib3 undo any gzip encoding before ijson sees the bytes
+            response.raw.decode_content = True
+            data = parse_emoji_list(response.raw)
+        else:
+            data = response.json()
+            # Filter out alias emojis (those that point to other emojis)
+            data["emoji"] = {name: url for name, url in data.get("emoji", {}).items()
+                             if not url.startswith("alias:")}
     if not data.get("ok"):
         print(f"Slack API Error: {data.get('error', 'Unknown error')}")
         sys.exit(1)
         
-    # Filter out alias emojis (those that point to other emojis)
-    custom_emojis = {}
-    for name, url in data["emoji"].items():
-        if not url.startswith("alias:"):
-            custom_emojis[name] = url
-            
-    # Save the emoji list to a file
-    with open(output_file, "w") as f:
-        json.dump(custom_emojis, f, indent=2)
-        
+    custom_emojis = data["emoji"]
     print(f"Found {len(custom_emojis)} custom emojis (excluding aliases)")
-    print(f"Emoji list saved to {output_file}")
+    
+    # Save the emoji list to a file
+    if save and output_file:
+        with open(output_file, "w") as f:
+            json.dump(custom_emojis, f, separators=(",", ":"))
+        print(f"Emoji list saved to {output_file}")
     
     return custom_emojis
 
-def download_emoji(name, url, output_dir):
-    """Download a single emoji image"""
+def preallocate(f, response):
+    """Reserve disk space for a download up front when its size is known"""
+    length = response.headers.get("Content-Length")
+    # Content-Length is the encoded size, so only trust it for unencoded bodies
+    if not hasattr(os, "posix_fallocate") or not length or response.headers.get("Content-Encoding"):
+        return
+    try:
+        os.posix_fallocate(f.fileno(), 0, int(length))
+    except (OSError, ValueError):
+        pass  # Not supported by this filesystem; fall back to growing the file
+
+def abort_response(response):
+    """Stop a streaming response from another thread by shutting down its socket,
+    which wakes a worker blocked reading it"""
+    connection = getattr(response.raw, "connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass  # Already closed
+
+class DownloadTracker:
+    """Shared download bookkeeping used to spot stragglers: recent durations, when each
+    responding attempt last made progress, and which emojis are already settled"""
+
+    def __init__(self, window=256, refresh_every=32):
+        self._lock = threading.Lock()
+        self._durations = deque(maxlen=window)
+        self._refresh_every = refresh_every
+        self._samples = 0
+        self._activity = {}
+        self._responses = {}
+        self._settled = set()
+        self.started = 0
+        self.p95 = None
+
+    def begin(self, attempt):
+        """Mark an attempt (a (name, part_suffix) pair) as picked up by a worker"""
+        with self._lock:
+            self.started += 1
+
+    def responding(self, attempt, response):
+        """Start an attempt's idle clock once its response headers arrive. Attempts still
+        waiting for a pooled connection aren't tracked, so they are never hedged."""
+        with self._lock:
+            self._activity[attempt] = time.monotonic()
+            self._responses[attempt] = response
+            settled = attempt[0] in self._settled
+        # The other copy won before this one's headers arrived
+        if settled:
+            abort_response(response)
+
+    def progress(self, attempt):
+        """Note that an attempt just received data"""
+        with self._lock:
+            self._activity[attempt] = time.monotonic()
+
+    def end(self, attempt):
+        with self._lock:
+            self._activity.pop(attempt, None)
+            self._responses.pop(attempt, None)
+
+    def idle_attempts(self, threshold):
+        """Return responding attempts that have received nothing for longer than threshold"""
+        now = time.monotonic()
+        with self._lock:
+            return [attempt for attempt, last in self._activity.items() if now - last > threshold]
+
+    def settle(self, name):
+        """Mark an emoji as finished and abort any duplicate attempt still streaming it"""
+        with self._lock:
+            self._settled.add(name)
+            losers = [response for (attempt_name, _), response in self._responses.items()
+                      if attempt_name == name]
+        for response in losers:
+            abort_response(response)
+
+    def is_settled(self, name):
+        with self._lock:
+            return name in self._settled
+
+    def record(self, duration):
+        """Add a completed download's duration, recomputing p95 every few samples"""
+        with self._lock:
+            self._durations.append(duration)
+            self._samples += 1
+            if self._samples % self._refresh_every == 0:
+                ordered = sorted(self._durations)
+                self.p95 = ordered[int(len(ordered) * 0.95)]
+
+def content_checksum(response):
+    """Return the algorithm and expected hex digest from a header defined as a hash of the
+    body (Repr-Digest, Digest or Content-MD5), else None. ETags are opaque and never used."""
+    # With Content-Encoding these hashes cover the encoded bytes, not the decoded ones we write
+    if response.headers.get("Content-Encoding"):
+        return None
+    for header in ("Repr-Digest", "Digest"):
+        for entry in response.headers.get(header, "").split(","):
+            algorithm, _, value = entry.strip().partition("=")
+            if algorithm.lower() in ("sha-256", "md5") and value:
+                try:
+                    expected = base64.b64decode(value.strip(":"), validate=True).hex()
+                except ValueError:
+                    continue
+                return algorithm.lower().replace("-", ""), expected
+    content_md5 = response.headers.get("Content-MD5")
+    if content_md5:
+        try:
+            return "md5", base64.b64decode(content_md5, validate=True).hex()
+        except ValueError:
+            pass
+    return None
+
+def integrity_md5():
+    """MD5 hasher for checksum headers, usable on FIPS builds where MD5 is restricted"""
+    try:
+        return hashlib.md5(usedforsecurity=False)
+    except TypeError:  # Python < 3.9
+        return hashlib.md5()
+
+def download_emoji(session, name, url, output_dir, tracker=None, part_suffix=".part"):
+    """Download a single emoji image, returning its name, path and SHA-256 digest
+    (None when the file was already downloaded by a previous run)"""
+    attempt = (name, part_suffix)
+    if tracker is not None:
+        tracker.begin(attempt)
+    try:
+        return fetch_emoji(session, name, url, output_dir, tracker, attempt)
+    finally:
+        if tracker is not None:
+            tracker.end(attempt)
+
+def fetch_emoji(session, name, url, output_dir, tracker, attempt):
+    """Stream one emoji to disk; see download_emoji"""
     if url.startswith("alias:"):
         return None
         
@@ -117,21 +342,66 @@ def download_emoji(name, url, output_dir):
         
     output_file = os.path.join(output_dir, f"{name}{extension}")
     
+    # Skip emojis already downloaded by a previous run
+    if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
+        return name, output_file, None
+    
+    # Download to a temporary name so an interrupted download isn't mistaken for a finished one.
+    # Hedged requests use their own suffix so the two copies never share a file.
+    partial_file = f"{output_file}{attempt[1]}"
+    
     try:
-        response = requests.get(url, stream=True)
-        if response.ok:
-            with open(output_file, "wb") as f:
-                for chunk in response.iter_content(chunk_size=1024):
-                    f.write(chunk)
-            return name, output_file
-        else:
-            print(f"Error downloading {name}: {response.status_code}")
-            return None
+        # Close the streamed response so its connection goes back to the pool
+        with session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            # Time from the response headers, so waiting on a busy pool doesn't count
+            started = time.monotonic()
+            if tracker is not None:
+                tracker.responding(attempt, response)
+            if response.ok:
+                # Hash while writing so verifying the download needs no second read
+                digest = hashlib.sha256()
+                check = content_checksum(response)
+                body_md5 = integrity_md5() if check and check[0] == "md5" else None
+                with open(partial_file, "wb") as f:
+                    preallocate(f, response)
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        # The other copy of a hedged download already won
+                        if tracker is not None and tracker.is_settled(name):
+                            break
+                        f.write(chunk)
+                        digest.update(chunk)
+                        if body_md5 is not None:
+                            body_md5.update(chunk)
+                        if tracker is not None:
+                            tracker.progress(attempt)
+                    else:
+                        # Drop any preallocated space the body didn't fill
+                        f.truncate()
+                if tracker is not None and tracker.is_settled(name):
+                    os.remove(partial_file)
+                    return None
+                if check:
+                    actual = (body_md5 or digest).hexdigest()
+                    if actual != check[1]:
+                        os.remove(partial_file)
+                        print(f"Error downloading {name}: content does not match its checksum header")
+                        return None
+                os.replace(partial_file, output_file)
+                if tracker is not None:
+                    tracker.record(time.monotonic() - started)
+                return name, output_file, digest.hexdigest()
+            else:
+                print(f"Error downloading {name}: {response.status_code}")
+                return None
     except Exception as e:
-        print(f"Error downloading {name}: {e}")
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
+        if tracker is None or not tracker.is_settled(name):
+            print(f"Error downloading {name}: {e}")
         return None
 
-def download_emojis(emoji_list, output_dir):
+def download_emojis(emoji_list, output_dir, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                    max_per_host=DEFAULT_MAX_PER_HOST):
     """Download all emoji images in parallel"""
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -148,27 +418,165 @@ def download_emojis(emoji_list, output_dir):
     print(f"Downloading {len(emoji_list)} emojis to {output_dir}...")
     
     downloaded = []
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = []
+    tracker = DownloadTracker()
+    completed = queue.Queue()
+    # The session's blocking pool holds each host to max_per_host connections
+    session = create_session(max_per_host)
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    try:
+        # Workers report finished futures on a queue, so each completion is handled once
+        # instead of re-waiting on every pending future
+        attempts = {}
+        owners = {}
         for name, url in emoji_list.items():
-            futures.append(executor.submit(download_emoji, name, url, output_dir))
+            future = executor.submit(download_emoji, session, name, url, output_dir, tracker)
+            owners[future] = name
+            attempts[name] = {future}
+            future.add_done_callback(completed.put)
+        submitted = len(attempts)
+        
+        progress = tqdm(total=len(attempts), unit="emoji") if tqdm is not None else None
+        hedged = set()
+        
+        # Collect results as they finish so one slow download doesn't hold up the rest
+        while attempts:
+            try:
+                future = completed.get(timeout=HEDGE_POLL_INTERVAL)
+            except queue.Empty:
+                future = None
+            if future is not None:
+                name = owners.pop(future)
+                remaining = attempts.get(name)
+                if remaining is None:
+                    continue  # A duplicate that lost the race
+                remaining.discard(future)
+                result = future.result()
+                # A failed attempt only counts once its hedged twin (if any) has also finished
+                if not result and remaining:
+                    continue
+                # First successful attempt wins; tell its twin to stop
+                del attempts[name]
+                tracker.settle(name)
+                for other in remaining:
+                    other.cancel()
+                if result:
+                    downloaded.append(result)
+                if progress is not None:
+                    progress.update(1)
             
-        for future in futures:
-            result = future.result()
-            if result:
-                downloaded.append(result)
+            # Once every download has started, hedge attempts that have stalled for longer
+            # than the recent p95 download time
+            if tracker.p95 is None or tracker.started < submitted:
+                continue
+            for name, _ in tracker.idle_attempts(tracker.p95):
+                if name in hedged or name not in attempts:
+                    continue
+                hedged.add(name)
+                submitted += 1
+                hedge = executor.submit(download_emoji, session, name, emoji_list[name], output_dir,
+                                        tracker, ".hedge.part")
+                owners[hedge] = name
+                attempts[name].add(hedge)
+                hedge.add_done_callback(completed.put)
+        
+        if progress is not None:
+            progress.close()
+    finally:
+        # Don't block on hedged duplicates that lost the race; settle() already aborted them
+        executor.shutdown(wait=False)
+        session.close()
                 
     print(f"Downloaded {len(downloaded)} emojis")
     return downloaded
 
-def upload_emoji(team_id, cookie, token, name, file_path):
+def encode_form_field(name, value):
+    """Encode a plain multipart/form-data field, including its leading boundary"""
+    return (f"--{UPLOAD_BOUNDARY}\r\n"
+            f"Content-Disposition: form-data; name=\"{name}\"\r\n\r\n"
+            f"{value}\r\n").encode()
+
+def encode_upload_form(token, name, filename, image, content_type):
+    """Build the multipart body for emoji.add around the raw image bytes"""
+    filename = filename.replace('"', "%22")
+    image_header = (f"--{UPLOAD_BOUNDARY}\r\n"
+                    f"Content-Disposition: form-data; name=\"image\"; filename=\"{filename}\"\r\n"
+                    f"Content-Type: {content_type}\r\n\r\n").encode()
+    return b"".join([
+        encode_form_field("token", token),
+        encode_form_field("mode", "data"),
+        encode_form_field("name", name),
+        image_header,
+        image,
+        f"\r\n--{UPLOAD_BOUNDARY}--\r\n".encode(),
+    ])
+
+class UploadThrottle:
+    """Rate limiter shared by upload workers that only slows down once Slack pushes back"""
+
+    def __init__(self, max_hold=60, max_spacing=5):
+        self._lock = threading.Lock()
+        # One-off pause after a rate-limit response, and how long the last one was
+        self._hold_until = 0.0
+        self._hold = 0.0
+        self._max_hold = max_hold
+        # Small gap kept between requests while recovering from a rate limit
+        self._next_slot = 0.0
+        self._spacing = 0.0
+        self._max_spacing = max_spacing
+        # Bumped on every rate-limit event, so responses to requests sent before it are ignored
+        self._generation = 0
+
+    def wait(self):
+        """Block until this worker may send its next request; returns a token for backoff()"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._hold_until, self._next_slot)
+            self._next_slot = start + self._spacing
+            generation = self._generation
+        if start > now:
+            time.sleep(start - now)
+        return generation
+
+    def backoff(self, sent_generation, retry_after=None):
+        """Record a rate-limit response and return how long workers will hold off"""
+        try:
+            retry_after = float(retry_after)
+        except (TypeError, ValueError):
+            retry_after = None
+        with self._lock:
+            now = time.monotonic()
+            # Another in-flight request already reported this rate limit
+            if sent_generation != self._generation:
+                return max(0.0, self._hold_until - now)
+            self._generation += 1
+            if retry_after is not None:
+                self._hold = retry_after
+            else:
+                self._hold = min(max(1.0, self._hold * 2), self._max_hold)
+            self._hold_until = max(self._hold_until, now + self._hold)
+            self._spacing = min(max(0.25, self._spacing * 2), self._max_spacing)
+            return self._hold_until - now
+
+    def success(self):
+        """Decay the hold and spacing back towards zero after a successful request"""
+        with self._lock:
+            self._hold = self._hold / 2 if self._hold >= 0.1 else 0.0
+            self._spacing = self._spacing / 2 if self._spacing >= 0.05 else 0.0
+
+def upload_emoji(session, throttle, team_id, cookie, token, name, file_path):
     """Upload a single emoji to a Slack workspace"""
     url = f"https://{team_id}.slack.com/api/emoji.add"
     
     headers = {
         "Cookie": cookie,
+        "Content-Type": UPLOAD_CONTENT_TYPE,
     }
     
+    # Encode the form once; retries resend the same body from memory
+    image = Path(file_path).read_bytes()
+    content_type = mimetypes.guess_type(str(file_path))[0] or "application/octet-stream"
+    body = encode_upload_form(token, name, Path(file_path).name, image, content_type)
+    
     backoff = 1
     max_retries = 5
     attempts = 0
@@ -176,79 +584,67 @@ def upload_emoji(team_id, cookie, token, name, file_path):
     while attempts < max_retries:
         attempts += 1
         
-        # Open the file for each attempt to ensure a fresh connection
-        with open(file_path, "rb") as f:
-            files = {
-                "image": f,
-                "mode": (None, "data"),
-                "name": (None, name),
-            }
-
-            data = {
-                "token": token
-            }
-
-            # Create a new session for each attempt to avoid connection-based rate limiting
-            with requests.Session() as session:
-                response = session.post(url, data=data, headers=headers, files=files)
-
-                if response.ok:
-                    data = response.json()
-                    if data.get("ok"):
-                        print(f"✓ Uploaded: {name}")
-                        return True
-                    else:
-                        error = data.get("error", "Unknown error")
-                        if error == "ratelimited":
-                            print(f"✗ Rate limited uploading {name}. Retrying with new connection in {backoff} seconds...")
-                            time.sleep(backoff)
-                            backoff *= 2
-                            continue
-                        else:
-                            print(f"✗ Error uploading {name}: {error}")
-                            return False
-                elif response.status_code == 429:
-                    print(f"✗ Rate limited uploading {name}: {response.status_code}. Retrying with new connection in {backoff} seconds...")
-                    time.sleep(backoff)
-                    backoff *= 2
+        generation = throttle.wait()
+        response = session.post(url, data=body, headers=headers)
+
+        if response.ok:
+            data = response.json()
+            if data.get("ok"):
+                throttle.success()
+                print(f"✓ Uploaded: {name}")
+                return True
+            else:
+                error = data.get("error", "Unknown error")
+                if error == "ratelimited":
+                    delay = throttle.backoff(generation, response.headers.get("Retry-After"))
+                    print(f"✗ Rate limited uploading {name}. Retrying in {delay:.1f} seconds...")
+                    continue
                 else:
-                    print(f"✗ Error uploading {name}: {response.status_code} {response.text}")
-                    if attempts < max_retries:
-                        print(f"    Retrying with new connection in {backoff} seconds...")
-                        time.sleep(backoff)
-                        backoff *= 2
-                    else:
-                        print(f"    Max retries reached. Giving up on {name}.")
-                        return False
+                    print(f"✗ Error uploading {name}: {error}")
+                    return False
+        elif response.status_code == 429:
+            delay = throttle.backoff(generation, response.headers.get("Retry-After"))
+            print(f"✗ Rate limited uploading {name}: {response.status_code}. Retrying in {delay:.1f} seconds...")
+        else:
+            print(f"✗ Error uploading {name}: {response.status_code} {error_excerpt(response)}")
+            if attempts < max_retries:
+                print(f"    Retrying in {backoff} seconds...")
+                time.sleep(backoff)
+                backoff *= 2
+            else:
+                print(f"    Max retries reached. Giving up on {name}.")
+                return False
 
     return False
 
-def upload_emojis(team_id, cookie, token, emoji_dir):
+def upload_emojis(team_id, cookie, token, emoji_dir, max_uploads=DEFAULT_MAX_UPLOADS):
     """Upload emoji images to a Slack workspace"""
-    # Get list of emoji files
-    emoji_files = []
-    for ext in ["*.png", "*.jpg", "*.jpeg", "*.gif"]:
-        emoji_files.extend(Path(emoji_dir).glob(ext))
+    # Get list of emoji files in a single pass over the directory
+    with os.scandir(emoji_dir) as entries:
+        emoji_files = [Path(entry.path) for entry in entries
+                       if entry.is_file() and os.path.splitext(entry.name)[1].lower() in EMOJI_EXTENSIONS]
     
     print(f"Found {len(emoji_files)} emoji files in {emoji_dir}")
     
     uploaded = 0
     failed = 0
 
-    # Use jittered delays between uploads
+    # Cap concurrent uploads and only slow down once Slack reports rate limiting.
+    # Slack rate-limits by token, so all uploads and retries share one session and throttle.
+    throttle = UploadThrottle()
+    # All uploads go to one host, so the session's pool is sized to keep every worker's
+    # connection alive between requests.
+    with create_session(max_uploads) as session, ThreadPoolExecutor(max_workers=max_uploads) as executor:
+        futures = []
+        for file_path in emoji_files:
+            futures.append(executor.submit(upload_emoji, session, throttle, team_id, cookie, token,
+                                           file_path.stem, file_path))
 
-    for file_path in emoji_files:
-        name = file_path.stem
-        print(f"Uploading {name}... ", end="", flush=True)
-        
-        if upload_emoji(team_id, cookie, token, name, file_path):
-            uploaded += 1
-        else:
-            failed += 1
-            
-        # Add a delay with jitter to avoid rate limiting
-        delay = 1 + random.uniform(0.5, 2.0)
-        time.sleep(delay)
+        for future in futures:
+            if future.result():
+                uploaded += 1
+            else:
+                failed += 1
     
     print(f"Uploaded {uploaded} emojis, failed {failed} emojis")
     return uploaded
@@ -273,16 +669,16 @@ def main():
         else:
             with open(args.emoji_list, "r") as f:
                 emoji_list = json.load(f)
-        download_emojis(emoji_list, args.output_dir)
+        download_emojis(emoji_list, args.output_dir, args.max_concurrency, args.max_per_host)
         
     elif args.command == "upload":
-        upload_emojis(args.team_id, args.cookie, args.token, args.emoji_dir)
+        upload_emojis(args.team_id, args.cookie, args.token, args.emoji_dir, args.max_uploads)
         
     elif args.command == "export":
-        # Run all steps
-        emoji_list = list_emojis(args.source_token, "emoji_list.json")
-        download_emojis(emoji_list, args.output_dir)
-        upload_emojis(args.team_id, args.cookie, args.token, args.output_dir)
+        # Run all steps, handing the emoji list straight to the download step
+        emoji_list = list_emojis(args.source_token, None, save=False)
+        download_emojis(emoji_list, args.output_dir, args.max_concurrency, args.max_per_host)
+        upload_emojis(args.team_id, args.cookie, args.token, args.output_dir, args.max_uploads)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file